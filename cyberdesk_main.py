@@ -6,11 +6,20 @@ Usa il widget Image nativo per mostrare PNG/JPG reali nel terminale.
 import os
 import sys
 import json
+import logging
+import re
 import shlex
 import shutil
+import time
+import asyncio
+import functools
+import operator
+import threading
 import subprocess
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Mapping, Optional
 from configparser import ConfigParser
 
 try:
@@ -19,17 +28,7 @@ try:
     from textual.widgets import Label, Header, Footer, Static
     from textual.screen import ModalScreen
     from textual.events import Key
-    
-    # Importiamo il widget Image nativo (richiede 'pip install textual-image')
-    try:
-        from textual_image.widget import Image
-        HAS_IMAGE = True
-    except ImportError:
-        # Fallback se manca la libreria specifica, usiamo quello built-in se disponibile in futuro
-        # o gestiamo l'errore gentilmente
-        HAS_IMAGE = False
-        print("⚠️  Manca 'textual-image'. Le icone reali non si vedranno.")
-        print("   Esegui: pip install textual-image")
+    from textual.worker import get_current_worker
 
 except ModuleNotFoundError:
     print("Manca una libreria base. Esegui: pip install textual textual-image")
@@ -38,6 +37,17 @@ except ModuleNotFoundError:
 CONFIG_DIR = Path(os.environ.get("XDG_CONFIG_HOME", Path.home() / ".config")) / "cyberdesk"
 CONFIG_DIR.mkdir(parents=True, exist_ok=True)
 
+# Log di debug su file solo con CYBERDESK_DEBUG=1: altrimenti nessun I/O al click
+logger = logging.getLogger("cyberdesk")
+logger.propagate = False  # mai sullo stderr: rovinerebbe la TUI
+if os.environ.get("CYBERDESK_DEBUG"):
+    _log_handler = logging.FileHandler(Path.home() / "debug_cyberdesk.txt", encoding="utf-8", delay=True)
+    _log_handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+    logger.addHandler(_log_handler)
+    logger.setLevel(logging.DEBUG)
+else:
+    logger.addHandler(logging.NullHandler())
+
 DESKTOP_PATHS = [Path("/usr/share/applications"), Path.home() / ".local/share/applications"]
 
 # Fallback Map (usata solo se non troviamo il file immagine)
@@ -53,12 +63,217 @@ ICON_MAP = {
     "uuctl": "", "usb": "",
 }
 
+# Un'unica regex per tutte le parole chiave. Vince la prima occorrenza nel testo e,
+# a parità di posizione, la parola più lunga: priorità deterministica, non più
+# legata all'ordine di inserimento nel dict
+_ICON_RE = re.compile("|".join(re.escape(k) for k in sorted(ICON_MAP, key=len, reverse=True)))
+
 def load_icon_overrides(path: Path) -> Dict[str, str]:
     if not path.exists(): return {}
     try:
         with open(path, "r", encoding="utf-8") as f: return json.load(f)
     except Exception: return {}
 
+_SHELL_QUOTES = ("'", '"', "\\")
+
+def split_command(command: str) -> List[str]:
+    """Divide un comando: shlex solo se ci sono virgolette/escape, altrimenti basta split()."""
+    if not any(q in command for q in _SHELL_QUOTES): return command.split()
+    try: return shlex.split(command)
+    except ValueError: return command.split()
+
+def _clean_exec(raw: str) -> str:
+    """Toglie i codici di campo (%f, %u, %U...) dalla riga Exec di un .desktop."""
+    if not any(q in raw for q in _SHELL_QUOTES):
+        return " ".join(p for p in raw.split() if not p.startswith("%"))
+    try:
+        # shlex.join mantiene le virgolette: split_command le ritrova al lancio
+        return shlex.join(p for p in shlex.split(raw) if not p.startswith("%"))
+    except ValueError:
+        return raw.split("%")[0].strip()
+
+def iter_desktop_files(directory: Path):
+    """
+    Elenca i *.desktop con os.scandir: (nome, percorso, stat) senza creare un Path
+    per file. Lo stat serve comunque alla cache, e DirEntry lo memorizza.
+    """
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                if not entry.name.endswith(".desktop"): continue
+                try:
+                    if entry.is_file(): yield entry.name, entry.path, entry.stat()
+                except OSError: continue
+    except OSError:
+        return
+
+APPS_CACHE_PATH = CONFIG_DIR / "apps_cache.json"
+# Da incrementare quando cambiano i campi prodotti da parse_desktop
+APPS_CACHE_VERSION = 2
+
+def load_apps_cache(path: Path) -> Dict[str, Dict]:
+    """Cache dei .desktop già parsati: {percorso: {mtime, size, parsed}}."""
+    if not path.exists(): return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != APPS_CACHE_VERSION: return {}
+        return {e["path"]: e for e in data["entries"]}
+    except Exception: return {}
+
+def save_apps_cache(path: Path, cache: Dict[str, Dict]) -> None:
+    try:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"version": APPS_CACHE_VERSION, "entries": list(cache.values())}, f)
+    except OSError: pass
+
+# Le sole chiavi di [Desktop Entry] che ci servono
+DESKTOP_KEYS = (b"Name", b"Exec", b"Icon", b"Terminal", b"NoDisplay")
+
+def _scan_desktop_entry(path) -> Optional[Dict[str, str]]:
+    """
+    Scanner minimale per i .desktop: legge solo [Desktop Entry] e si ferma appena
+    ha trovato tutte le DESKTOP_KEYS o inizia un'altra sezione.
+    Solleva ValueError se il file non è nel formato semplice atteso.
+    """
+    entry: Dict[str, str] = {}
+    in_section = False
+    with open(path, "rb") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith((b"#", b";")): continue
+            if line.startswith(b"["):
+                if in_section: break
+                in_section = line == b"[Desktop Entry]"
+                continue
+            if not in_section: continue
+            key, sep, value = line.partition(b"=")
+            if not sep: raise ValueError(f"riga non valida: {line!r}")
+            key = key.strip()
+            if key in DESKTOP_KEYS and key.decode() not in entry:
+                entry[key.decode()] = value.strip().decode("utf-8")
+                if len(entry) == len(DESKTOP_KEYS): break
+    return entry if in_section else None
+
+def read_desktop_entry(path) -> Optional[Mapping[str, str]]:
+    """Chiavi di [Desktop Entry], o None se manca la sezione o il file è illeggibile."""
+    try:
+        return _scan_desktop_entry(path)
+    except OSError:
+        return None
+    except ValueError:
+        pass
+    # File "strano" (righe di continuazione, encoding...): ci pensa ConfigParser
+    cfg = ConfigParser(interpolation=None)
+    try: cfg.read(path, encoding="utf-8")
+    except: return None
+    if "Desktop Entry" not in cfg: return None
+    return cfg["Desktop Entry"]
+
+ICON_INDEX_PATH = CONFIG_DIR / "icon_index.json"
+ICON_INDEX_TTL = 24 * 3600
+
+ICON_SEARCH_ROOTS = [
+    Path("/usr/share/pixmaps"),
+    Path("/usr/share/icons/hicolor"),
+    Path("/usr/share/icons/Adwaita"),
+    Path("/usr/share/icons/breeze"),
+    Path("/usr/share/icons/Papirus"),
+    Path.home() / ".local/share/icons"
+]
+# Preferiamo risoluzioni alte per la grafica reale
+ICON_RESOLUTIONS = ["256x256", "128x128", "64x64", "48x48", "scalable"]
+ICON_SUBDIRS = ["apps", "categories", "places", "devices"]
+# SVG supportato da textual-image in molti casi, ma PNG è più sicuro
+ICON_EXTENSIONS = [".png", ".svg", ".jpg", ".ico"]
+
+def _icon_roots_stamp(roots: List[str]) -> Dict[str, float]:
+    """
+    Mtime delle root e delle sottocartelle root/risoluzione/categoria esistenti:
+    se cambia, l'indice su disco è da rifare. L'mtime di una cartella cambia solo
+    per i suoi figli diretti, quindi quello delle root da solo non basta.
+    """
+    stamp = {}
+    for directory in roots + [
+        os.path.join(root, res, sub)
+        for root in roots for res in ICON_RESOLUTIONS for sub in ICON_SUBDIRS
+    ]:
+        try: stamp[directory] = os.stat(directory).st_mtime
+        except OSError: continue
+    return stamp
+
+def _add_icon_files(dirpath: str, filenames: List[str], index: Dict[str, str]) -> None:
+    """Aggiunge all'indice i file immagine di una cartella (il primo inserito vince)."""
+    icons = []
+    for fn in filenames:
+        stem, ext = os.path.splitext(fn)
+        if ext in ICON_EXTENSIONS: icons.append((ICON_EXTENSIONS.index(ext), stem.lower(), fn))
+    # A parità di nome, PNG prima di SVG/JPG/ICO
+    for _, stem, fn in sorted(icons):
+        index.setdefault(stem, os.path.join(dirpath, fn))
+
+def _build_icon_index(roots: List[str]) -> Dict[str, str]:
+    """Scansiona una volta sola le root, in ordine di priorità (prima i file diretti)."""
+    # 1. Root diretta (es. /usr/share/pixmaps/firefox.png)
+    # 2. Sottocartelle root/risoluzione/categoria preferite
+    directories = list(roots) + [
+        os.path.join(root, res, sub)
+        for root in roots for res in ICON_RESOLUTIONS for sub in ICON_SUBDIRS
+    ]
+    index: Dict[str, str] = {}
+    for directory in directories:
+        top = next(os.walk(directory), None)  # solo il primo livello
+        if top: _add_icon_files(top[0], top[2], index)
+    # 3. Tutto il resto dell'albero (altre risoluzioni, layout tipo breeze "apps/48")
+    for root in roots:
+        for dirpath, dirnames, filenames in os.walk(root, followlinks=False):
+            dirnames.sort()
+            _add_icon_files(dirpath, filenames, index)
+    return index
+
+_icon_index_lock = threading.Lock()
+
+def get_icon_index() -> Dict[str, str]:
+    """Indice {nome_icona: percorso}, costruito una sola volta anche se chiamato da più thread."""
+    with _icon_index_lock:
+        return _load_icon_index()
+
+def rebuild_icon_index() -> None:
+    """Scarta l'indice, in memoria e su disco: la prossima ricerca riscansiona le cartelle."""
+    with _icon_index_lock:
+        _load_icon_index.cache_clear()
+        try: ICON_INDEX_PATH.unlink()
+        except OSError: pass
+
+@functools.lru_cache(maxsize=1)
+def _load_icon_index() -> Dict[str, str]:
+    """
+    Ricarica l'indice da disco se le cartelle principali non sono cambiate e ha meno
+    di ICON_INDEX_TTL secondi (lo stamp non vede i cambi nel resto dell'albero),
+    altrimenti lo ricostruisce.
+    """
+    roots = [str(root) for root in ICON_SEARCH_ROOTS if root.is_dir()]
+    stamp = _icon_roots_stamp(roots)
+    try:
+        with open(ICON_INDEX_PATH, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+        if cached.get("stamp") == stamp and time.time() - cached.get("built", 0) < ICON_INDEX_TTL:
+            return cached["index"]
+    except Exception: pass
+
+    index = _build_icon_index(roots)
+    try:
+        with open(ICON_INDEX_PATH, "w", encoding="utf-8") as f:
+            json.dump({"stamp": stamp, "built": time.time(), "index": index}, f)
+    except OSError: pass
+    return index
+
+@functools.lru_cache(maxsize=512)
+def _which(name: str) -> Optional[str]:
+    """shutil.which memoizzato: ogni click non rifà la scansione del PATH."""
+    return shutil.which(name)
+
+@functools.lru_cache(maxsize=4096)
 def find_real_icon_path(icon_name: str) -> Optional[str]:
     """Cerca il percorso reale del file immagine (PNG/JPG/SVG)."""
     if not icon_name: return None
@@ -67,39 +282,7 @@ def find_real_icon_path(icon_name: str) -> Optional[str]:
     if path_obj.is_absolute() and path_obj.exists():
         return str(path_obj)
     
-    clean_name = path_obj.stem
-    search_roots = [
-        Path("/usr/share/pixmaps"),
-        Path("/usr/share/icons/hicolor"),
-        Path("/usr/share/icons/Adwaita"),
-        Path("/usr/share/icons/breeze"),
-        Path("/usr/share/icons/Papirus"),
-        Path.home() / ".local/share/icons"
-    ]
-    # Preferiamo risoluzioni alte per la grafica reale
-    resolutions = ["256x256", "128x128", "64x64", "48x48", "scalable"]
-    subdirs = ["apps", "categories", "places", "devices"]
-    # SVG supportato da textual-image in molti casi, ma PNG è più sicuro
-    extensions = [".png", ".svg", ".jpg", ".ico"] 
-
-    # 1. Cerca nella root diretta (es. /usr/share/pixmaps/firefox.png)
-    for root in search_roots:
-        if not root.exists(): continue
-        for ext in extensions:
-            direct = root / (clean_name + ext)
-            if direct.exists(): return str(direct)
-
-    # 2. Cerca nelle sottocartelle
-    for root in search_roots:
-        if not root.exists(): continue
-        for res in resolutions:
-            for sub in subdirs:
-                for ext in extensions:
-                    candidate = root / res / sub / (clean_name + ext)
-                    if candidate.exists(): return str(candidate)
-                    candidate_lower = root / res / sub / (clean_name.lower() + ext)
-                    if candidate_lower.exists(): return str(candidate_lower)
-    return None
+    return get_icon_index().get(path_obj.stem.lower())
 
 class HelpScreen(ModalScreen):
     CSS = """
@@ -119,6 +302,56 @@ class HelpScreen(ModalScreen):
     def on_key(self, event: Key) -> None:
         if event.key == "escape" or event.key.lower() == "k": self.dismiss()
 
+@functools.lru_cache(maxsize=1)
+def get_image_cls():
+    """
+    Importa al primo uso il widget Image nativo (richiede 'pip install textual-image'),
+    che si porta dietro Pillow. None se manca o se CYBERDESK_NO_IMAGES è impostata.
+    """
+    if os.environ.get("CYBERDESK_NO_IMAGES"): return None
+    try:
+        from textual_image.widget import Image
+    except ImportError:
+        logger.warning("textual-image non disponibile: niente icone reali")
+        return None
+    return Image
+
+# Lato massimo (in pixel) dell'immagine decodificata: basta e avanza per 6 righe di celle
+ICON_PIXELS = 128
+# Immagini decodificate tenute in memoria (ognuna al massimo ICON_PIXELS² RGBA)
+ICON_CACHE_SIZE = 256
+
+# LRU a mano (non lru_cache) perché le card devono poter chiedere "è già pronta?"
+_icon_images: "OrderedDict[str, object]" = OrderedDict()
+_icon_images_lock = threading.Lock()
+
+def cached_icon_image(path: str):
+    """L'immagine già decodificata, o None: non decodifica mai."""
+    with _icon_images_lock:
+        img = _icon_images.get(path)
+        if img is not None: _icon_images.move_to_end(path)
+        return img
+
+def load_icon_image(path: str):
+    """
+    Decodifica (una volta sola) l'icona e la riduce a ICON_PIXELS x ICON_PIXELS.
+    Il widget Image va creato ogni volta, ma il PIL già pronto si riusa tra i cambi pagina.
+    """
+    img = cached_icon_image(path)
+    if img is not None: return img
+    from PIL import Image as PILImage
+    with PILImage.open(path) as img:
+        img = img.convert("RGBA")
+    img.thumbnail((ICON_PIXELS, ICON_PIXELS))
+    with _icon_images_lock:
+        _icon_images[path] = img
+        while len(_icon_images) > ICON_CACHE_SIZE: _icon_images.popitem(last=False)
+    return img
+
+def clear_icon_images() -> None:
+    with _icon_images_lock:
+        _icon_images.clear()
+
 class AppIcon(Static):
     DEFAULT_CSS = """
     AppIcon {
@@ -158,63 +391,82 @@ class AppIcon(Static):
     }
     """
 
-    def __init__(self, app_id: str, label: str, icon: str, command: str, icon_path: Optional[str], terminal: bool = False) -> None:
+    # Nessuna copia dei campi: la card legge direttamente il dict dell'app in CyberDesk.apps
+    __slots__ = ("_data",)
+
+    def __init__(self, app: Dict) -> None:
         super().__init__()
-        self.app_id = app_id
-        self.app_name = label or "Unknown"
-        self.icon_char = icon or "?"
-        self.command = command
-        self.icon_file_path = icon_path
-        self.is_terminal = terminal
+        self._data = app
+
+    @property
+    def app_id(self) -> str:
+        return self._data["id"]
+
+    @property
+    def app_name(self) -> str:
+        return self._data.get("Name") or "Unknown"
+
+    def _make_image(self):
+        icon_path = self._data.get("icon_path")
+        if not icon_path: return None
+        Image = get_image_cls()
+        if Image is None: return None
+        try:
+            # Solo immagini già pronte: la decodifica la fa _prefetch_icons,
+            # fuori dall'event loop (intanto si vede il glifo)
+            pil_img = cached_icon_image(icon_path)
+            if pil_img is None: return None
+            # Textual Image gestisce automaticamente il rendering migliore
+            img_widget = Image(pil_img)
+            # Impostiamo una dimensione in celle fissa per il layout
+            img_widget.styles.width = "100%"
+            img_widget.styles.height = 6
+            return img_widget
+        except Exception:
+            # Se fallisce (es. SVG complesso o formato strano), fallback
+            return None
 
     def compose(self) -> ComposeResult:
-        img_widget = None
-        
-        if HAS_IMAGE and self.icon_file_path:
-            try:
-                # Textual Image gestisce automaticamente il rendering migliore
-                img_widget = Image(self.icon_file_path)
-                # Impostiamo una dimensione in celle fissa per il layout
-                img_widget.styles.width = "100%"
-                img_widget.styles.height = 6
-            except Exception:
-                # Se fallisce (es. SVG complesso o formato strano), fallback
-                img_widget = None
+        img_widget = self._make_image()
 
         if img_widget:
             yield img_widget
         else:
-            yield Label(self.icon_char, classes="fallback-glyph")
+            yield Label(self._data.get("icon") or "?", classes="fallback-glyph")
             
         yield Label(self.app_name, classes="icon-label")
 
+    def refresh_icon(self) -> None:
+        """Sostituisce il glifo di fallback con l'immagine, se nel frattempo è stata trovata/decodificata."""
+        glyphs = self.query(".fallback-glyph")
+        if not glyphs: return
+        img_widget = self._make_image()
+        if not img_widget: return
+        for glyph in glyphs:
+            self.mount(img_widget, before=glyph)
+            glyph.remove()
+
     def on_click(self) -> None:
         self.launch_app()
 
     def launch_app(self):
-        # --- DEBUG SETUP ---
-        log_path = Path.home() / "debug_cyberdesk.txt"
-        def log(msg):
-            with open(log_path, "a", encoding="utf-8") as f:
-                f.write(f"[App: {self.app_name}] {msg}\n")
-        # -------------------
-
-        log(f"Click rilevato. Comando originale: {self.command}")
-        log(f"Richiede terminale? {self.is_terminal}")
-
-        if not self.command: 
-            log("Nessun comando trovato. Esco.")
+        command = self._data.get("Exec")
+        is_terminal = self._data.get("terminal", False)
+
+        logger.debug("[App: %s] Click rilevato. Comando originale: %s", self.app_name, command)
+        logger.debug("[App: %s] Richiede terminale? %s", self.app_name, is_terminal)
+
+        if not command: 
+            logger.debug("[App: %s] Nessun comando trovato. Esco.", self.app_name)
             return
         
-        cmd_parts = []
-        try: cmd_parts = shlex.split(self.command)
-        except ValueError: cmd_parts = self.command.split()
+        cmd_parts = split_command(command)
         
         if not cmd_parts: return
 
         # Gestione App CLI
-        if self.is_terminal:
-            log("Cerco un emulatore di terminale...")
+        if is_terminal:
+            logger.debug("[App: %s] Cerco un emulatore di terminale...", self.app_name)
             # Aggiunto x-terminal-emulator che è standard su molti linux
             terminals = [
                 ("x-terminal-emulator", "-e"),
@@ -229,9 +481,9 @@ class AppIcon(Static):
             
             found_term = None
             for term, flag in terminals:
-                if shutil.which(term):
+                if _which(term):
                     found_term = (term, flag)
-                    log(f"Trovato terminale: {term}")
+                    logger.debug("[App: %s] Trovato terminale: %s", self.app_name, term)
                     break
             
             if found_term:
@@ -239,22 +491,22 @@ class AppIcon(Static):
                 # Costruiamo il comando finale
                 prefix = [term_exe, term_flag] if term_flag else [term_exe]
                 cmd_parts = prefix + cmd_parts
-                log(f"Comando finale costruito: {cmd_parts}")
+                logger.debug("[App: %s] Comando finale costruito: %s", self.app_name, cmd_parts)
             else:
-                log("ERRORE: Nessun terminale trovato nella lista.")
+                logger.error("[App: %s] Nessun terminale trovato nella lista.", self.app_name)
                 self.app.notify("❌ Nessun terminale trovato!", severity="error")
                 return
 
         executable = cmd_parts[0]
-        # Nota: se usiamo un terminale, l'eseguibile è il terminale stesso, quindi shutil.which funzionerà
-        if not shutil.which(executable):
-            log(f"ERRORE: Eseguibile {executable} non trovato nel PATH.")
+        # Nota: se usiamo un terminale, l'eseguibile è il terminale stesso, quindi _which funzionerà
+        if not _which(executable):
+            logger.error("[App: %s] Eseguibile %s non trovato nel PATH.", self.app_name, executable)
             self.app.notify(f"❌ Non trovato: {executable}", severity="error")
             return
             
         self.app.notify(f"🚀 {self.app_name}", timeout=2)
         try:
-            log("Tentativo di avvio subprocess...")
+            logger.debug("[App: %s] Tentativo di avvio subprocess...", self.app_name)
             subprocess.Popen(
                 cmd_parts, 
                 start_new_session=True,
@@ -264,9 +516,9 @@ class AppIcon(Static):
                 close_fds=True, 
                 cwd=str(Path.home())
             )
-            log("Subprocess lanciato con successo (teorico).")
+            logger.debug("[App: %s] Subprocess lanciato con successo (teorico).", self.app_name)
         except Exception as e:
-            log(f"EXCEPTION durante Popen: {e}")
+            logger.exception("[App: %s] Eccezione durante Popen", self.app_name)
             self.app.notify(f"❌ {e}", severity="error")
 
 class CyberDesk(App):
@@ -284,6 +536,17 @@ class CyberDesk(App):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.apps: List[Dict] = []
+        # Id in parallelo a self.apps: il diff della pagina non tocca i dict
+        self._app_ids: List[str] = []
+        self._apps_lock = threading.Lock()
+        self._apps_cache = load_apps_cache(APPS_CACHE_PATH)
+        # Widget già montati nella griglia, per app_id: si aggiornano solo le differenze
+        self._mounted: Dict[str, AppIcon] = {}
+        self._last_render_sig = None
+        self._render_lock = asyncio.Lock()
+        self._resize_pending = False
+        self._resize_task: Optional[asyncio.Task] = None
+        self._last_cols: Optional[int] = None
         self.icons_override = load_icon_overrides(CONFIG_DIR / "icons.json")
         self.page_offset = 0
         self.CARD_WIDTH = 32 
@@ -299,21 +562,37 @@ class CyberDesk(App):
 
     async def on_mount(self) -> None:
         self.title = "CyberDesk"
-        self.load_apps()
+        # Il parsing gira in un thread: Header/Footer vengono disegnati subito
+        await asyncio.to_thread(self.load_apps)
         await self.render_icons()
         self.call_after_refresh(self.refresh_grid_columns)
+        self.start_icon_prefetch()
+
+    def on_unmount(self) -> None:
+        save_apps_cache(APPS_CACHE_PATH, self._apps_cache)
 
     async def on_resize(self, event) -> None:
         """
         Gestisce il ridimensionamento con un debounce.
         Evita di ridisegnare 100 volte mentre trascini la finestra.
         """
-        # Se c'è già un timer attivo (stiamo ancora ridimensionando), lo annulliamo
-        if hasattr(self, "_resize_timer") and self._resize_timer:
-            self._resize_timer.stop()
-            
-        # Impostiamo un nuovo timer: ridisegna solo se ci fermiamo per 0.3 secondi
-        self._resize_timer = self.set_timer(0.3, self.redraw_after_resize)
+        # Segnaliamo solo che c'è un resize in corso: un unico task accorpa tutti gli eventi
+        self._resize_pending = True
+        if self._resize_task is None:
+            self._resize_task = asyncio.create_task(self._resize_worker())
+
+    async def _resize_worker(self) -> None:
+        """
+        Aspetta che il ridimensionamento si 'stabilizzi' (un tick da 50 ms senza eventi).
+        """
+        try:
+            while True:
+                await asyncio.sleep(0.05)
+                if not self._resize_pending: break
+                self._resize_pending = False
+            await self.redraw_after_resize()
+        finally:
+            self._resize_task = None
 
     async def redraw_after_resize(self) -> None:
         """
@@ -324,13 +603,15 @@ class CyberDesk(App):
         
         # 2. IMPORTANTE: Ricarica le icone!
         # Se la finestra è più grande, magari ora ci stanno più app per pagina.
-        # Senza questo, la griglia cambia forma ma le icone restano vecchie/spostate male.
+        # render_icons non fa nulla se colonne e righe non sono cambiate.
         await self.render_icons()
 
     def refresh_grid_columns(self) -> None:
         try:
             width = self.size.width
             cols = max(1, (width - 4) // self.CARD_WIDTH)
+            if cols == self._last_cols: return
+            self._last_cols = cols
             self.grid.styles.grid_size_columns = cols
         except Exception: pass
 
@@ -342,8 +623,11 @@ class CyberDesk(App):
         elif event.key.lower() == "p" or event.key == "left":
             self.change_page(-1)
         elif event.key.lower() == "r":
-            self.load_apps()
-            await self.render_icons()
+            clear_icon_images()
+            _which.cache_clear()
+            await asyncio.to_thread(self.reload_all)
+            await self.render_icons(force=True)
+            self.start_icon_prefetch()
             self.notify("App ricaricate")
         elif event.key == "escape":
             self.exit()
@@ -356,100 +640,200 @@ class CyberDesk(App):
         except: per_page = 12
         
         if direction > 0:
-            self.page_offset = min(len(self.apps) - per_page, self.page_offset + per_page)
+            new_offset = max(0, min(len(self.apps) - per_page, self.page_offset + per_page))
         else:
-            self.page_offset = max(0, self.page_offset - per_page)
+            new_offset = max(0, self.page_offset - per_page)
+        # Già sulla prima/ultima pagina: niente da ridisegnare
+        if new_offset == self.page_offset: return
+        self.page_offset = new_offset
         self.run_worker(self.render_icons())
+        # Ricentra il prefetch sulla nuova pagina
+        self.start_icon_prefetch()
 
-    async def render_icons(self):
-        await self.grid.remove_children()
+    async def render_icons(self, force: bool = False):
+        """
+        Aggiorna la griglia montando/smontando solo le card che cambiano.
+        force=True scarta tutti i widget esistenti (es. dopo un reload).
+        """
+        async with self._render_lock:
+            await self._render_icons(force)
+
+    async def _render_icons(self, force: bool):
         try:
             cols = self.grid.styles.grid_size_columns or 3
             rows = max(1, (self.size.height - 6) // 14) 
             per_page = max(1, cols * rows)
-        except: per_page = 15
+        except:
+            cols, rows = None, None
+            per_page = 15
+
+        if force:
+            await self.grid.remove_children()
+            self._mounted.clear()
+            self._last_render_sig = None
+
+        # Lista e id vanno letti insieme: load_apps li sostituisce da un altro thread
+        with self._apps_lock:
+            apps, app_ids = self.apps, self._app_ids
+
+        sig = (self.page_offset, cols, rows, len(apps))
+        if sig == self._last_render_sig: return
+        self._last_render_sig = sig
 
         start = max(0, self.page_offset)
-        end = min(len(self.apps), start + per_page)
-        page_apps = self.apps[start:end]
+        end = min(len(apps), start + per_page)
         
         status = self.query_one("#status", Label)
         current = (start // per_page) + 1
-        status.update(f"  Apps: {len(self.apps)}  |  📄 Pagina {current}  |  [K] Comandi")
-
-        for app in page_apps:
-            btn = AppIcon(
-                app.get("id"), 
-                app.get("Name"), 
-                app.get("icon"), 
-                app.get("Exec"),
-                app.get("icon_path"),
-                app.get("terminal", False)
-            )
-            await self.grid.mount(btn)
+        status.update(f"  Apps: {len(apps)}  |  📄 Pagina {current}  |  [K] Comandi")
+
+        visible_ids = app_ids[start:end]
+        to_remove = self._mounted.keys() - set(visible_ids)
+        if to_remove:
+            await self.grid.remove_children([self._mounted.pop(k) for k in to_remove])
+
+        widgets = [AppIcon(apps[i]) for i in range(start, end) if app_ids[i] not in self._mounted]
+        if widgets:
+            self._mounted.update((btn.app_id, btn) for btn in widgets)
+            # Un solo mount per tutte le card nuove: un solo passaggio del compositor
+            await self.grid.mount_all(widgets)
+
+        # Riordina senza rimontare: sposta solo le card fuori posto
+        for i, app_id in enumerate(visible_ids):
+            widget = self._mounted[app_id]
+            if self.grid.children[i] is not widget:
+                self.grid.move_child(widget, before=i)
+
+    def start_icon_prefetch(self) -> None:
+        # Senza widget Image nessuna card mostrerà un'icona: inutile scansionare i temi
+        if get_image_cls() is None: return
+        self.run_worker(self._prefetch_icons, thread=True, exclusive=True, group="icons")
+
+    def _prefetch_icons(self) -> None:
+        """
+        Worker in background: risolve le icone reali dopo il primo disegno,
+        le decodifica fuori dall'event loop e le sostituisce ai glifi delle card
+        già montate. Parte dalla pagina visibile e va verso quelle vicine.
+        """
+        worker = get_current_worker()
+        with self._apps_lock:
+            apps = self.apps
+        start = min(max(0, self.page_offset), len(apps))
+        # Pagina visibile e successive, poi le precedenti dalla più vicina
+        ordered = apps[start:] + apps[:start][::-1]
+        # Oltre la capienza della cache si scaccerebbero proprio le pagine vicine
+        to_decode = ICON_CACHE_SIZE
+
+        for app in ordered:
+            if worker.is_cancelled: return
+            path = app.get("icon_path")
+            # Se il percorso è già noto (es. da apps_cache.json) basta decodificare
+            lookup = not path
+            if lookup:
+                if not app.get("icon_name"): continue
+                path = find_real_icon_path(app["icon_name"])
+                if not path: continue
+            decoded = False
+            if to_decode:
+                to_decode -= 1
+                try: decoded = load_icon_image(path) is not None
+                except Exception: continue
+            if lookup: app["icon_path"] = path
+            # La card può essere già montata col glifo (anche se il percorso era noto)
+            if decoded and app["id"] in self._mounted:
+                self.call_from_thread(self._update_icon, app["id"])
+
+    def _update_icon(self, app_id: str) -> None:
+        widget = self._mounted.get(app_id)
+        if widget: widget.refresh_icon()
+
+    def reload_all(self) -> None:
+        """
+        Ricarica tutto da disco (tasto R). Va eseguito in un thread: rebuild_icon_index
+        aspetta il lock dell'indice, che il prefetch tiene per tutta la scansione.
+        """
+        rebuild_icon_index()
+        find_real_icon_path.cache_clear()
+        self.load_apps(use_cache=False)
 
-    def load_apps(self):
-        apps = []
+    def load_apps(self, use_cache: bool = True):
+        """
+        Carica le app dai .desktop. Con use_cache, i file con mtime e dimensione
+        invariati non vengono riparsati (compreso il percorso dell'icona).
+        """
+        # Dedup per desktop id (nome file) prima del parsing: le cartelle successive
+        # sovrascrivono le precedenti, quindi ~/.local vince su /usr (come da XDG)
+        by_id: Dict[str, tuple] = {}
         for d in DESKTOP_PATHS:
-            if not d.exists(): continue
-            for p in d.glob("*.desktop"):
-                data = self.parse_desktop(p)
-                if data: apps.append(data)
-            seen = set()
-            filtered = []
-        for a in apps:
-            key = (a.get("Name"), a.get("Exec"))
-            if key not in seen:
-                filtered.append(a)
-                seen.add(key)
-        self.apps = sorted(filtered, key=lambda x: x["Name"].lower())
-        if not self.apps: self.apps = [{"id": "1", "Name": "Term", "Exec": "bash", "icon": "", "icon_path": None, "terminal": True}]
-
-    def parse_desktop(self, path: Path) -> Optional[Dict]:
-        cfg = ConfigParser(interpolation=None)
-        try: cfg.read(path, encoding="utf-8")
-        except: return None
-        if "Desktop Entry" not in cfg: return None
-        entry = cfg["Desktop Entry"]
+            for name, path, st in iter_desktop_files(d):
+                by_id[name[:-len(".desktop")]] = (path, st)
+
+        cache: Dict[str, Dict] = {}
+        to_parse = []
+        for path, st in by_id.values():
+            entry = self._apps_cache.get(path) if use_cache else None
+            if entry and entry["mtime"] == st.st_mtime and entry["size"] == st.st_size:
+                cache[path] = entry
+            else:
+                cache[path] = {"path": path, "mtime": st.st_mtime, "size": st.st_size, "parsed": None}
+                to_parse.append(path)
+
+        # Lavoro dominato da open()/stat(): i thread lo parallelizzano bene
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            for path, data in zip(to_parse, executor.map(self.parse_desktop, to_parse)):
+                cache[path]["parsed"] = data
+
+        filtered = [entry["parsed"] for entry in cache.values() if entry["parsed"]]
+        filtered.sort(key=operator.itemgetter("_sortkey"))
+        if not filtered: filtered = [{"id": "1", "Name": "Term", "Exec": "bash", "icon": "", "icon_path": None, "terminal": True}]
+        with self._apps_lock:
+            self.apps = filtered
+            self._app_ids = [a["id"] for a in filtered]
+            self._apps_cache = cache
+
+    def parse_desktop(self, path: str) -> Optional[Dict]:
+        desktop_id = os.path.basename(path)[:-len(".desktop")]
+        entry = read_desktop_entry(path)
+        if entry is None: return None
         if entry.get("NoDisplay", "false").lower() == "true": return None
         
-        name = entry.get("Name", path.stem)
+        name = entry.get("Name", desktop_id)
         raw_exec = entry.get("Exec", "")
         icon_name = entry.get("Icon", "")
         # --- NUOVO: Leggiamo se serve il terminale ---
         term_val = entry.get("Terminal", "false").lower()
         is_terminal = term_val in ("true", "1")
         
-        exec_clean = ""
-        if raw_exec:
-            try:
-                parts = [p for p in shlex.split(raw_exec) if not p.startswith("%")]
-                exec_clean = " ".join(parts)
-            except ValueError:
-                exec_clean = raw_exec.split("%")[0].strip()
-
-        real_icon_path = find_real_icon_path(icon_name)
-
-        # Fallback Glifo solo se manca l'immagine
-        icon_char = "?"
-        if not real_icon_path:
-            lower_name = (exec_clean + " " + icon_name).lower()
-            for k, v in ICON_MAP.items():
-                if k in lower_name: 
-                    icon_char = v
-                    break
-            if icon_char == "?": icon_char = name[:1].upper()
+        exec_clean = _clean_exec(raw_exec) if raw_exec else ""
+
+        # L'icona reale la cerca _prefetch_icons dopo il primo disegno:
+        # il glifo di fallback serve subito
+        m = _ICON_RE.search((exec_clean + " " + icon_name).lower())
+        icon_char = ICON_MAP[m.group(0)] if m else name[:1].upper()
 
         return {
-            "id": path.stem, 
+            "id": desktop_id, 
             "Name": name, 
             "Exec": exec_clean, 
             "icon": icon_char, 
-            "icon_path": real_icon_path
-            ,
+            "icon_name": icon_name,
+            "icon_path": None,
             "terminal": is_terminal,
+            # Chiave di ordinamento calcolata una volta (casefold gestisce bene l'Unicode)
+            "_sortkey": name.casefold(),
         }
 
 if __name__ == "__main__":
+    # textual-image interroga il terminale quando viene importato, cosa impossibile
+    # una volta avviato Textual: se servono le immagini, va caricato adesso
+    if not os.environ.get("CYBERDESK_NO_IMAGES") and get_image_cls() is None:
+        print("⚠️  Manca 'textual-image'. Le icone reali non si vedranno.")
+        print("   Esegui: pip install textual-image")
+    # uvloop (opzionale) riduce l'overhead per tick dell'event loop di Textual
+    try:
+        import uvloop
+        loop = uvloop.new_event_loop()
+    except ImportError:
+        loop = None
     app = CyberDesk()
-    app.run()
\ No newline at end of file
+    app.run(loop=loop)
\ No newline at end of file